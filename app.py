@@ -1,14 +1,12 @@
 import streamlit as st
 import json
-from io import BytesIO
 
 from claim_extractor import extract_claims
-from claim_verifier import verify_claim_pipeline, compute_trust_score
+from claim_verifier import CORPUS_PATH, verify_claim_pipeline, compute_trust_score
 from citation_verifier import verify_citations
-
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
+from index_compression import INDEX_PATH, INDEX_CONFIG_PATH
+from report_generator import report_key, get_pdf_report
+from results_store import record_results
 
 # ================= HEADER =================
 col1, col2 = st.columns([1, 5])
@@ -42,6 +40,7 @@ st.sidebar.title("⚙️ Settings")
 
 show_confidence = st.sidebar.checkbox("📊 Show confidence scores", value=True)
 show_evidence = st.sidebar.checkbox("📄 Show retrieved evidence", value=True)
+source_model = st.sidebar.text_input("🤖 Source model (for statistics)", value="unknown")
 
 
 # ================= STYLES =================
@@ -84,30 +83,6 @@ input_text = st.text_area(
 verify_btn = st.button("🔍 Verify")
 
 
-# ================= PDF GENERATOR =================
-def generate_pdf_report(results, trust_score):
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
-    story = []
-
-    story.append(Paragraph("<b>AI Hallucination Verification Report</b>", styles["Title"]))
-    story.append(Spacer(1, 12))
-    story.append(Paragraph(f"<b>Trust Score:</b> {trust_score}%", styles["Normal"]))
-    story.append(Spacer(1, 12))
-
-    for i, r in enumerate(results, 1):
-        story.append(Paragraph(f"<b>Claim {i}:</b> {r['claim']}", styles["Normal"]))
-        story.append(Paragraph(f"Verdict: {r['label']}", styles["Normal"]))
-        story.append(Paragraph(f"Confidence: {r['confidence']}", styles["Normal"]))
-        story.append(Paragraph(f"Explanation: {r.get('explanation','')}", styles["Normal"]))
-        story.append(Spacer(1, 15))
-
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
-
-
 # ================= VERIFICATION LOGIC =================
 if verify_btn:
     if not input_text.strip():
@@ -130,6 +105,19 @@ if verify_btn:
 
             # ================= TRUST SCORE =================
             trust_score = compute_trust_score(results)
+            # Cheap key for this run: input text + index / corpus version
+            run_report_key = report_key(input_text, (INDEX_PATH, INDEX_CONFIG_PATH, CORPUS_PATH))
+
+            # Statistics store: one run per distinct text, index and source model
+            # per session, so clicking Verify again on the same text is not
+            # counted twice. Analytics failures never block the results.
+            run_key = (run_report_key, source_model)
+            if st.session_state.get("last_recorded_run") != run_key:
+                try:
+                    record_results(results, trust_score, source_model)
+                    st.session_state["last_recorded_run"] = run_key
+                except Exception as e:
+                    st.warning(f"Could not record run statistics: {e}")
 
             supported = sum(1 for r in results if r["label"] == "Supported")
             contradicted = sum(1 for r in results if r["label"] == "Contradicted")
@@ -182,20 +170,27 @@ if verify_btn:
             # ================= DOWNLOADS =================
             st.divider()
 
+            # JSON is serialized once per run and kept in the session;
+            # the PDF is built once per run and served from disk
+            json_report = st.session_state.get("json_report")
+            if not json_report or json_report[0] != run_report_key:
+                json_report = (run_report_key, json.dumps(results, indent=2).encode("utf-8"))
+                st.session_state["json_report"] = json_report
+
             st.download_button(
                 "⬇️ Download JSON Report",
-                json.dumps(results, indent=2),
+                json_report[1],
                 "verification_report.json",
                 "application/json"
             )
 
-            pdf = generate_pdf_report(results, trust_score)
-            st.download_button(
-                "📄 Download PDF Report",
-                pdf,
-                "ai_verification_report.pdf",
-                "application/pdf"
-            )
+            with open(get_pdf_report(results, trust_score, run_report_key), "rb") as f:
+                st.download_button(
+                    "📄 Download PDF Report",
+                    f,
+                    "ai_verification_report.pdf",
+                    "application/pdf"
+                )
 
 
 # ================= CITATION VERIFICATION =================
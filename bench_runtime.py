@@ -0,0 +1,144 @@
+import argparse
+import multiprocessing as mp
+import queue as queue_errors
+import time
+
+# =========================
+# Benchmark Workload
+# =========================
+
+BENCH_CLAIMS = [
+    "Large language models often hallucinate factual information.",
+    "FAISS is a library developed by Meta for similarity search.",
+    "Machine learning is a subset of artificial intelligence.",
+    "Natural language processing was invented in 2015.",
+    "Studies show that large language models hallucinate in over 60% of cases.",
+    "Artificial intelligence systems can perform reasoning and perception."
+]
+
+# Max seconds one configuration may take (model loading included)
+CONFIG_TIMEOUT = 1800
+
+
+def worker(worker_id, workers, threads, n_claims, barrier, queue):
+    # Fresh (spawned) interpreter: configure before torch / faiss load
+    from runtime_config import configure_runtime
+    configure_runtime(
+        mode="single" if threads == 1 else "multi",
+        threads=threads,
+        worker_id=worker_id,
+        workers=workers
+    )
+
+    from claim_verifier import verify_claim_pipeline
+
+    claims = [BENCH_CLAIMS[i % len(BENCH_CLAIMS)] for i in range(n_claims)]
+    verify_claim_pipeline(claims[0])  # warm-up
+
+    # Breaks (instead of hanging) if another worker died before reaching it
+    barrier.wait(timeout=CONFIG_TIMEOUT)
+    start = time.perf_counter()
+    for claim in claims:
+        verify_claim_pipeline(claim)
+    queue.put(time.perf_counter() - start)
+
+
+def run_config(workers, threads, total_claims):
+    """
+    Runs total_claims split across workers, each using threads threads.
+    Returns (claims/second for the whole box, None), or (None, reason)
+    if a worker failed or the configuration timed out.
+    """
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    queue = ctx.Queue()
+    per_worker = max(1, total_claims // workers)
+
+    procs = [
+        ctx.Process(target=worker, args=(i, workers, threads, per_worker, barrier, queue))
+        for i in range(workers)
+    ]
+    for p in procs:
+        p.start()
+
+    elapsed = []
+    deadline = time.time() + CONFIG_TIMEOUT
+    error = None
+    try:
+        while len(elapsed) < workers:
+            try:
+                elapsed.append(queue.get(timeout=5))
+            except queue_errors.Empty:
+                failed = [p.exitcode for p in procs if p.exitcode not in (None, 0)]
+                if failed:
+                    error = f"worker exited with code {failed[0]}"
+                    break
+                if time.time() > deadline:
+                    error = f"timed out after {CONFIG_TIMEOUT}s"
+                    break
+    finally:
+        for p in procs:
+            if p.is_alive() and error:
+                p.terminate()
+            p.join()
+
+    if error:
+        return None, error
+    return (per_worker * workers) / max(elapsed), None
+
+
+def candidate_configs(cores, max_workers):
+    """
+    (workers, threads) pairs for every divisor of the core count, from one
+    multi-threaded worker to many single-threaded ones. The single-threaded
+    mode is always measured, with at most max_workers workers.
+    """
+    configs = []
+    for threads in range(cores, 0, -1):
+        if cores % threads:
+            continue
+        workers = cores // threads
+        if workers <= max_workers:
+            configs.append((workers, threads))
+
+    single = (min(cores, max_workers), 1)
+    if single not in configs:
+        configs.append(single)
+
+    return configs
+
+# =========================
+# Main
+# =========================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find the best worker/thread split for this machine")
+    parser.add_argument("--claims", type=int, default=48, help="claims verified per configuration")
+    parser.add_argument("--max-workers", type=int, default=4,
+                        help="cap on worker processes (each loads its own models)")
+    args = parser.parse_args()
+
+    from runtime_config import available_cpus
+    cores = len(available_cpus())
+
+    print(f"🖥️  {cores} cores available")
+    print(f"{'workers':>8} {'threads':>8} {'claims/s':>10}")
+
+    best = None
+    for workers, threads in candidate_configs(cores, args.max_workers):
+        throughput, error = run_config(workers, threads, args.claims)
+        if error:
+            print(f"{workers:>8} {threads:>8} {'failed':>10}  ({error})")
+            continue
+        print(f"{workers:>8} {threads:>8} {throughput:>10.2f}")
+        if best is None or throughput > best[2]:
+            best = (workers, threads, throughput)
+
+    if best is None:
+        raise SystemExit("❌ Every configuration failed; see worker errors above.")
+
+    workers, threads, throughput = best
+    mode = "single" if threads == 1 else "multi"
+    print(f"\n✅ Best: {workers} worker(s) × {threads} thread(s) ({throughput:.2f} claims/s)")
+    print(f"   HALLUCINOT_RUNTIME_MODE={mode} HALLUCINOT_THREADS={threads} "
+          f"HALLUCINOT_WORKERS={workers} HALLUCINOT_WORKER_ID=<0..{workers - 1}>")
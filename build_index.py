@@ -1,9 +1,20 @@
+from runtime_config import configure_runtime
+
+# Thread limits must be set before torch / faiss are imported
+RUNTIME = configure_runtime()
+
+import argparse
 import json
 import faiss
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
-import json
+from index_compression import COMPRESSION_PRESETS, build_compressed_index, save_index
+
+parser = argparse.ArgumentParser(description="Build the FAISS evidence index")
+parser.add_argument("--compress", choices=sorted(COMPRESSION_PRESETS),
+                    help="train a compressed index; search re-ranks with full vectors")
+args = parser.parse_args()
 
 with open("data/corpus.json", "r", encoding="utf-8") as f:
     base_corpus = json.load(f)
@@ -26,12 +37,16 @@ embeddings = model.encode(texts, show_progress_bar=True)
 embeddings = np.array(embeddings).astype("float32")
 
 # Create FAISS index
-dimension = embeddings.shape[1]
-index = faiss.IndexFlatL2(dimension)
-index.add(embeddings)
-
-# Save index
-faiss.write_index(index, "data/corpus.index")
+if args.compress:
+    index, compression = build_compressed_index(embeddings, args.compress)
+else:
+    dimension = embeddings.shape[1]
+    index = faiss.IndexFlatL2(dimension)
+    index.add(embeddings)
+    compression = None
+
+# Save index (+ full vectors and index config)
+save_index(index, embeddings, compression)
 
 # Save metadata
 with open("data/doc_ids.json", "w") as f:
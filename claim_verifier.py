@@ -1,6 +1,14 @@
+from runtime_config import configure_runtime
+
+# Thread limits must be set before torch / faiss are imported
+RUNTIME = configure_runtime()
+
 import json
+import re
+from collections import OrderedDict
 import faiss
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 from transformers import pipeline
 
@@ -28,15 +36,24 @@ with open(CORPUS_PATH, "r", encoding="utf-8") as f:
 print("📦 Loading FAISS index...")
 import os
 
-INDEX_PATH = "data/corpus.index"
+from index_compression import (
+    INDEX_PATH, RERANK_FACTOR, load_index_config, load_full_vectors, save_index, search_index
+)
+
+faiss_index = None
+full_vectors = None  # set only for compressed indexes (memory-mapped)
+rerank_factor = RERANK_FACTOR
+
+def load_faiss():
+    global faiss_index, full_vectors, rerank_factor
+    if faiss_index is None:
+        faiss_index = faiss.read_index(INDEX_PATH)
+        index_config = load_index_config()
+        full_vectors = load_full_vectors(index_config)
+        rerank_factor = index_config.get("rerank_factor", RERANK_FACTOR)
 
 if os.path.exists(INDEX_PATH):
     print("📦 Loading FAISS index...")
-    faiss_index = None
-    def load_faiss():
-         global faiss_index
-         if faiss_index is None:
-             faiss_index = faiss.read_index("data/corpus.index")
 
 else:
     print("⚠️ FAISS index not found. Building index...")
@@ -50,7 +67,9 @@ else:
     faiss_index = faiss.IndexFlatL2(dimension)
     faiss_index.add(embeddings)
 
-    faiss.write_index(faiss_index, INDEX_PATH)
+    # Also rewrites the vectors and index config, so a stale compressed
+    # config from an earlier build is never paired with this flat index
+    save_index(faiss_index, embeddings, None)
     print("✅ FAISS index built and saved")
 
 
@@ -71,7 +90,8 @@ def retrieve_evidence(claim, top_k=3):
     embedding = embedder.encode([claim])
     embedding = np.array(embedding).astype("float32")
 
-    _, indices = faiss_index.search(embedding, top_k)
+    # Compressed first stage + exact re-ranking when full vectors exist
+    _, indices = search_index(faiss_index, embedding, top_k, full_vectors, rerank_factor)
 
     evidence_docs = []
 
@@ -102,6 +122,198 @@ def retrieve_evidence(claim, top_k=3):
 
     return evidence_docs
 
+# =========================
+# Premise Windowing (Token Budget)
+# =========================
+
+# Max tokens per MNLI pair (premise window + claim + special tokens).
+# bart-large-mnli accepts 1024, but most evidence fits in far less.
+PREMISE_TOKEN_BUDGET = 320
+# Fraction of each window shared with the next one
+PREMISE_WINDOW_OVERLAP = 0.25
+# Premise windows never shrink below this, even for very long claims
+MIN_PREMISE_WINDOW = 64
+# Window sizes are rounded down to a multiple of this so claims of
+# similar length share cached windows
+WINDOW_SIZE_STEP = 32
+# Max (window, claim) pairs per forward pass
+NLI_BATCH_SIZE = 8
+# Max cached passages (token ids) and (passage, window size) window lists
+PREMISE_CACHE_SIZE = 2048
+
+STOPWORDS = {
+    "the", "and", "for", "are", "was", "were", "with", "that", "this",
+    "from", "its", "has", "have", "had", "but", "not", "can", "into",
+    "than", "then", "they", "their", "there", "which", "who", "been",
+    "being", "over", "about", "also", "such", "these", "those", "often"
+}
+
+# corpus id -> premise token ids (tokenized once per passage)
+_premise_token_cache = OrderedDict()
+# (corpus id, window size) -> [(window token ids, window content words)]
+_premise_window_cache = OrderedDict()
+# Both are LRU-bounded; passages without a corpus id are not cached
+
+
+def content_words(text):
+    return {
+        w for w in re.findall(r"\w+", text.lower())
+        if len(w) > 2 and w not in STOPWORDS
+    } | set(re.findall(r"\d+", text))
+
+
+def lru_get(cache, key, build):
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+
+    value = build()
+    cache[key] = value
+    if len(cache) > PREMISE_CACHE_SIZE:
+        cache.popitem(last=False)
+    return value
+
+
+def get_premise_tokens(doc):
+    """
+    Tokenizes a passage once and caches its token ids per corpus id.
+    """
+    doc_id = doc.get("id", "unknown")
+
+    def tokenize():
+        return nli.tokenizer(doc.get("text", ""), add_special_tokens=False)["input_ids"]
+
+    if doc_id == "unknown":
+        return tokenize()
+    return lru_get(_premise_token_cache, doc_id, tokenize)
+
+
+def get_premise_windows(doc, window_size):
+    """
+    Splits the cached passage token ids into windows of window_size and
+    caches them together with their content words.
+    Returns a list of (token_ids, content_words) tuples.
+    """
+    doc_id = doc.get("id", "unknown")
+
+    def build():
+        windows = split_premise_windows(get_premise_tokens(doc), window_size)
+
+        # Single-window passages are never filtered, so skip decoding them
+        if len(windows) == 1:
+            return [(windows[0], None)]
+        return [
+            (w, content_words(nli.tokenizer.decode(w, skip_special_tokens=True)))
+            for w in windows
+        ]
+
+    if doc_id == "unknown":
+        return build()
+    return lru_get(_premise_window_cache, (doc_id, window_size), build)
+
+
+def split_premise_windows(token_ids, window_size):
+    """
+    Splits premise token ids into overlapping windows of window_size tokens.
+    """
+    if len(token_ids) <= window_size:
+        return [token_ids]
+
+    stride = max(1, int(window_size * (1 - PREMISE_WINDOW_OVERLAP)))
+    windows = []
+    start = 0
+    while True:
+        windows.append(token_ids[start:start + window_size])
+        if start + window_size >= len(token_ids):
+            break
+        start += stride
+
+    return windows
+
+
+def select_premise_windows(claim, windows):
+    """
+    Drops windows that share no content words with the claim.
+    Falls back to all windows if nothing overlaps lexically.
+    Returns the token ids of the kept windows.
+    """
+    all_ids = [ids for ids, _ in windows]
+    if len(windows) == 1:
+        return all_ids
+
+    claim_words = content_words(claim)
+    if not claim_words:
+        return all_ids
+
+    selected = [ids for ids, words in windows if claim_words & words]
+
+    return selected or all_ids
+
+
+def score_premise_windows(windows, claim_ids):
+    """
+    Runs MNLI on pre-tokenized (window, claim) pairs in mini-batches
+    of NLI_BATCH_SIZE.
+    Returns one list of label-score dicts per window (same shape as nli()).
+    """
+    tokenizer = nli.tokenizer
+    probs = []
+
+    for start in range(0, len(windows), NLI_BATCH_SIZE):
+        batch = tokenizer.pad(
+            {"input_ids": [
+                tokenizer.build_inputs_with_special_tokens(w, claim_ids)
+                for w in windows[start:start + NLI_BATCH_SIZE]
+            ]},
+            return_tensors="pt"
+        )
+        batch = {k: v.to(nli.model.device) for k, v in batch.items()}
+
+        with torch.no_grad():
+            logits = nli.model(**batch).logits
+        probs.extend(torch.softmax(logits, dim=-1).cpu().tolist())
+
+    id2label = nli.model.config.id2label
+    return [
+        [{"label": id2label[i].upper(), "score": p} for i, p in enumerate(row)]
+        for row in probs
+    ]
+
+
+def aggregate_window_scores(window_outputs):
+    """
+    Keeps the most decisive window: the one with the highest
+    entailment or contradiction score.
+    """
+    def decisiveness(outputs):
+        return max(
+            (r["score"] for r in outputs if r["label"] in ("ENTAILMENT", "CONTRADICTION")),
+            default=0.0
+        )
+
+    return max(window_outputs, key=decisiveness)
+
+
+def nli_long_premise(doc, claim, token_budget=PREMISE_TOKEN_BUDGET):
+    """
+    Scores a claim against a possibly long premise by sliding a
+    token-budgeted window over it instead of truncating.
+    """
+    special = nli.tokenizer.num_special_tokens_to_add(pair=True)
+    max_positions = nli.model.config.max_position_embeddings
+
+    # Very long claims are clipped so that a minimum-size window still fits
+    claim_ids = nli.tokenizer(claim, add_special_tokens=False)["input_ids"]
+    claim_ids = claim_ids[:max_positions - special - MIN_PREMISE_WINDOW]
+
+    window_size = min(token_budget, max_positions) - len(claim_ids) - special
+    window_size = max(MIN_PREMISE_WINDOW, window_size // WINDOW_SIZE_STEP * WINDOW_SIZE_STEP)
+    window_size = min(window_size, max_positions - len(claim_ids) - special)
+
+    windows = select_premise_windows(claim, get_premise_windows(doc, window_size))
+
+    return aggregate_window_scores(score_premise_windows(windows, claim_ids))
+
 # =========================
 # Label Mapping
 # =========================
@@ -129,9 +341,10 @@ def generate_explanation(label, evidence):
 # Claim Verification (MNLI)
 # =========================
 
-def verify_claim(claim, evidence_docs):
+def verify_claim(claim, evidence_docs, token_budget=PREMISE_TOKEN_BUDGET):
     """
     Verifies a claim against retrieved evidence using MNLI.
+    Long premises are scored window by window within token_budget.
 
     Returns:
     {
@@ -151,12 +364,8 @@ def verify_claim(claim, evidence_docs):
         if not premise:
             continue
 
-        # MNLI inference
-        outputs = nli(
-            premise,
-            text_pair=claim,
-            top_k=None
-        )
+        # MNLI inference (sliding window over long premises)
+        outputs = nli_long_premise(doc, claim, token_budget)
 
         # outputs is a LIST of dicts
         for r in outputs:
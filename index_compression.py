@@ -0,0 +1,225 @@
+import json
+import os
+
+import faiss
+import numpy as np
+
+# =========================
+# Compression Presets
+# =========================
+# name -> (faiss index_factory string, min training vectors)
+# Memory per 384-dim MiniLM vector: flat float32 = 1536 bytes.
+# Ratios below are per-vector upper bounds; the PCA / OPQ matrices and
+# PQ codebooks are a fixed cost, so small corpora see less (at 12k vectors
+# pca-sq8 measured ~5.8x, opq-pq ~17x). Run this module for real numbers.
+
+COMPRESSION_PRESETS = {
+    "sq8": ("SQ8", 1),                         # 384 B  (4x)
+    "pca-sq8": ("PCA192,SQ8", 384),            # 192 B  (up to 8x)
+    "opq-pq": ("OPQ48_192,PQ48", 256 * 39)     # 48 B   (up to 32x)
+}
+
+INDEX_PATH = "data/corpus.index"
+VECTORS_PATH = "data/corpus_vectors.npy"
+INDEX_CONFIG_PATH = "data/index_config.json"
+
+# First-stage candidates fetched per requested result before exact re-ranking
+RERANK_FACTOR = 10
+
+# Below this many vectors the recall report has too few held-out queries
+# to mean anything
+MIN_REPORT_VECTORS = 100
+
+# =========================
+# Build
+# =========================
+
+def build_compressed_index(embeddings, preset):
+    """
+    Trains and fills a compressed FAISS index.
+    Falls back to a flat index when there are too few vectors to train on,
+    or when the trained index (codes + PCA / OPQ matrices, codebooks)
+    would not be smaller than the raw vectors.
+    """
+    factory, min_train = COMPRESSION_PRESETS[preset]
+    dimension = embeddings.shape[1]
+
+    def flat_index():
+        index = faiss.IndexFlatL2(dimension)
+        index.add(embeddings)
+        return index, None
+
+    if len(embeddings) < min_train:
+        print(f"⚠️ {preset} needs at least {min_train} vectors to train, "
+              f"got {len(embeddings)}. Using flat index.")
+        return flat_index()
+
+    index = faiss.index_factory(dimension, factory)
+    index.train(embeddings)
+    index.add(embeddings)
+
+    size = index_bytes(index)
+    if size >= embeddings.nbytes:
+        print(f"⚠️ {preset} index ({size / 2**20:.2f} MB) is not smaller than the raw "
+              f"vectors ({embeddings.nbytes / 2**20:.2f} MB) at {len(embeddings)} vectors. "
+              "Using flat index.")
+        return flat_index()
+
+    return index, preset
+
+
+def save_index(index, embeddings, compression):
+    """
+    Saves the index, the full-precision vectors (used for re-ranking
+    compressed indexes and for the compression report) and a small config file.
+    """
+    faiss.write_index(index, INDEX_PATH)
+    np.save(VECTORS_PATH, embeddings)
+
+    with open(INDEX_CONFIG_PATH, "w", encoding="utf-8") as f:
+        json.dump({
+            "compression": compression,
+            "vectors_path": VECTORS_PATH,
+            "rerank_factor": RERANK_FACTOR
+        }, f, indent=2)
+
+# =========================
+# Search
+# =========================
+
+def load_index_config():
+    if not os.path.exists(INDEX_CONFIG_PATH):
+        return {"compression": None}
+    with open(INDEX_CONFIG_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_full_vectors(config):
+    """
+    Memory-maps the full-precision vectors; only rows touched
+    by re-ranking are ever paged in.
+    """
+    path = config.get("vectors_path")
+    if not config.get("compression") or not path or not os.path.exists(path):
+        return None
+    return np.load(path, mmap_mode="r")
+
+
+def rerank(query, candidate_ids, vectors, top_k):
+    """
+    Exact L2 re-ranking of first-stage candidates against full vectors.
+    """
+    ids = np.unique(candidate_ids[candidate_ids >= 0])  # sorted -> sequential reads
+    if len(ids) == 0:
+        return ids, np.empty(0, dtype="float32")
+
+    diffs = np.asarray(vectors[ids], dtype="float32") - query
+    distances = np.einsum("ij,ij->i", diffs, diffs)
+    order = np.argsort(distances)[:top_k]
+    return ids[order], distances[order]
+
+
+def search_index(index, query_embedding, top_k, vectors=None, rerank_factor=RERANK_FACTOR):
+    """
+    Searches the index for one query. With full vectors available, fetches
+    top_k * rerank_factor compressed candidates and re-ranks them exactly.
+    Returns (distances, indices) shaped like faiss (1, top_k).
+    """
+    if vectors is None:
+        return index.search(query_embedding, top_k)
+
+    k = min(index.ntotal, top_k * rerank_factor)
+    _, candidates = index.search(query_embedding, k)
+    ids, distances = rerank(query_embedding[0], candidates[0], vectors, top_k)
+
+    # Pad like faiss does when fewer than top_k results exist
+    pad = top_k - len(ids)
+    ids = np.concatenate([ids, np.full(pad, -1, dtype="int64")])
+    distances = np.concatenate([distances, np.full(pad, np.inf, dtype="float32")])
+    return distances[None, :], ids[None, :]
+
+# =========================
+# Recall vs Memory Report
+# =========================
+
+def index_bytes(index):
+    return len(faiss.serialize_index(index))
+
+
+def recall_at_k(found, truth):
+    if truth.size == 0:
+        return float("nan")
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def compression_report(embeddings, top_k=3, n_queries=1000, queries=None, seed=0):
+    """
+    Compares every preset with the exact flat index: index memory,
+    recall@k of the compressed search alone and with exact re-ranking.
+    Pass real claim embeddings as queries if available; otherwise
+    n_queries corpus vectors are held out of the index and used instead
+    (in-index queries would find themselves and inflate recall).
+    """
+    if queries is None:
+        if len(embeddings) < MIN_REPORT_VECTORS:
+            raise ValueError(
+                f"Need at least {MIN_REPORT_VECTORS} vectors for a meaningful "
+                f"recall report, got {len(embeddings)}. Pass real claim "
+                "embeddings as queries or use a larger corpus."
+            )
+        rng = np.random.default_rng(seed)
+        n_queries = max(1, min(n_queries, len(embeddings) // 10))
+        order = rng.permutation(len(embeddings))
+        queries = embeddings[order[:n_queries]]
+        embeddings = embeddings[np.sort(order[n_queries:])]
+
+    flat = faiss.IndexFlatL2(embeddings.shape[1])
+    flat.add(embeddings)
+    _, truth = flat.search(queries, top_k)
+    flat_bytes = index_bytes(flat)
+
+    rows = [{
+        "preset": "flat",
+        "index_mb": round(flat_bytes / 2**20, 2),
+        "reduction": 1.0,
+        "recall": 1.0,
+        "recall_reranked": 1.0
+    }]
+
+    for preset in COMPRESSION_PRESETS:
+        index, compression = build_compressed_index(embeddings, preset)
+        if compression is None:
+            continue
+
+        _, approx = index.search(queries, top_k)
+        reranked = np.vstack([
+            search_index(index, q[None, :], top_k, embeddings)[1] for q in queries
+        ])
+
+        size = index_bytes(index)
+        rows.append({
+            "preset": preset,
+            "index_mb": round(size / 2**20, 2),
+            "reduction": round(flat_bytes / size, 1),
+            "recall": round(recall_at_k(approx, truth), 3),
+            "recall_reranked": round(recall_at_k(reranked, truth), 3)
+        })
+
+    return rows
+
+
+if __name__ == "__main__":
+    # Reads the vectors saved by: python build_index.py
+    embeddings = np.load(VECTORS_PATH)
+
+    print(f"📦 {len(embeddings)} vectors × {embeddings.shape[1]} dims")
+    try:
+        rows = compression_report(embeddings)
+    except ValueError as e:
+        raise SystemExit(f"⚠️ {e}")
+
+    print(f"{'preset':>10} {'index MB':>10} {'reduction':>10} {'recall@3':>10} {'+rerank':>10}")
+    for row in rows:
+        print(f"{row['preset']:>10} {row['index_mb']:>10} {row['reduction']:>9}x "
+              f"{row['recall']:>10} {row['recall_reranked']:>10}")
@@ -0,0 +1,212 @@
+import csv
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet
+
+# =========================
+# Report Cache
+# =========================
+
+REPORT_DIR = os.path.join(tempfile.gettempdir(), "hallucinot_reports")
+# Cached reports older than this, or beyond this count, are pruned
+REPORT_MAX_AGE = 24 * 3600
+REPORT_MAX_FILES = 200
+
+CSV_FIELDS = [
+    "claim",
+    "label",
+    "confidence",
+    "evidence_id",
+    "evidence_source",
+    "explanation"
+]
+
+
+def report_key(input_text, version_paths=()):
+    """
+    Cheap cache key for a verification run: the input text plus the
+    modification times of the index / corpus files it was verified against.
+    """
+    h = hashlib.sha256(input_text.encode("utf-8"))
+    for path in version_paths:
+        if os.path.exists(path):
+            h.update(f"{path}:{os.path.getmtime(path)}".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def report_path(key, ext):
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    return os.path.join(REPORT_DIR, f"report_{key}.{ext}")
+
+
+def prune_reports():
+    """
+    Removes cached reports (and stray temp files) older than REPORT_MAX_AGE,
+    then the oldest ones until at most REPORT_MAX_FILES remain.
+    """
+    now = time.time()
+    files = []
+    for name in os.listdir(REPORT_DIR):
+        path = os.path.join(REPORT_DIR, name)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            continue  # removed by another session
+        files.append((mtime, path))
+
+    files.sort(reverse=True)
+    for i, (mtime, path) in enumerate(files):
+        if i >= REPORT_MAX_FILES or now - mtime > REPORT_MAX_AGE:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def write_atomic(path, write_fn, mode="w"):
+    """
+    Writes to a unique temp file next to path and renames it into place,
+    so a half-written report is never served from the cache, even when
+    several Streamlit sessions (threads) write the same report at once.
+    """
+    prune_reports()
+
+    fd, tmp_path = tempfile.mkstemp(dir=REPORT_DIR, suffix=".tmp")
+    try:
+        if "b" in mode:
+            with os.fdopen(fd, mode) as f:
+                write_fn(f)
+        else:
+            with os.fdopen(fd, mode, encoding="utf-8", newline="") as f:
+                write_fn(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return path
+
+# =========================
+# Streaming Exports
+# =========================
+
+def flatten_result(r):
+    evidence = r.get("evidence") or {}
+    return {
+        "claim": r.get("claim", ""),
+        "label": r.get("label", ""),
+        "confidence": r.get("confidence", 0.0),
+        "evidence_id": evidence.get("id", ""),
+        "evidence_source": evidence.get("source", ""),
+        "explanation": r.get("explanation", "")
+    }
+
+
+def stream_jsonl(results, f):
+    """
+    Writes one JSON object per line as results arrive.
+    results can be any iterable, including a generator.
+    """
+    for r in results:
+        f.write(json.dumps(r, default=str))
+        f.write("\n")
+        f.flush()
+
+
+def stream_csv(results, f):
+    """
+    Writes one CSV row per result as results arrive.
+    """
+    writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for r in results:
+        writer.writerow(flatten_result(r))
+        f.flush()
+
+
+STREAM_WRITERS = {
+    "jsonl": stream_jsonl,
+    "csv": stream_csv
+}
+
+
+def export_results(results, path, fmt="jsonl"):
+    """
+    Streams results to path in jsonl or csv format.
+    Usable from batch / headless code without Streamlit.
+    """
+    if fmt not in STREAM_WRITERS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        STREAM_WRITERS[fmt](results, f)
+
+    return path
+
+# =========================
+# Cached Reports
+# =========================
+
+def pdf_story(results, trust_score, styles):
+    story = []
+
+    story.append(Paragraph("<b>AI Hallucination Verification Report</b>", styles["Title"]))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph(f"<b>Trust Score:</b> {trust_score}%", styles["Normal"]))
+    story.append(Spacer(1, 12))
+
+    for i, r in enumerate(results, 1):
+        story.append(Paragraph(f"<b>Claim {i}:</b> {r['claim']}", styles["Normal"]))
+        story.append(Paragraph(f"Verdict: {r['label']}", styles["Normal"]))
+        story.append(Paragraph(f"Confidence: {r['confidence']}", styles["Normal"]))
+        story.append(Paragraph(f"Explanation: {r.get('explanation','')}", styles["Normal"]))
+        story.append(Spacer(1, 15))
+
+    return story
+
+
+def get_pdf_report(results, trust_score, key):
+    """
+    Returns the path of the PDF report, building it only once per result set.
+    key is report_key(input_text, ...) for the run.
+    ReportLab still lays out the whole story and buffers the PDF in memory
+    while building; the gain is that this happens once per result set and
+    reruns are served from the file on disk.
+    """
+    path = report_path(key, "pdf")
+    if os.path.exists(path):
+        return path
+
+    def build(f):
+        doc = SimpleDocTemplate(f, pagesize=A4)
+        doc.build(pdf_story(results, trust_score, getSampleStyleSheet()))
+
+    return write_atomic(path, build, mode="wb")
+
+# =========================
+# Headless Export
+# =========================
+
+if __name__ == "__main__":
+    # Usage: python report_generator.py input.txt output.jsonl|output.csv
+    from claim_extractor import extract_claims
+    from claim_verifier import verify_claim_pipeline
+
+    input_path, output_path = sys.argv[1], sys.argv[2]
+    fmt = "csv" if output_path.endswith(".csv") else "jsonl"
+
+    with open(input_path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    results = (verify_claim_pipeline(c) for c in extract_claims(text))
+    export_results(results, output_path, fmt)
+
+    print(f"✅ Report written to {output_path}")
@@ -0,0 +1,342 @@
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# =========================
+# Store Layout
+# =========================
+# data/results_store/date=YYYY-MM-DD/part-<time>-<id>.parquet     one per run
+# data/results_store/date=YYYY-MM-DD/compact-<time>-<id>.parquet  merged runs
+# data/results_store/date=YYYY-MM-DD/_compact-<...>.manifest.json part files
+#                                                                 a compact file replaces
+# Rows are only ever added. Once a day has COMPACT_THRESHOLD part files,
+# they are merged into one compact file with large row groups. Readers skip
+# part files listed in the manifest of a visible compact file, so the parts
+# are only deleted after the merged rows are already being read.
+
+STORE_DIR = "data/results_store"
+
+# Fixed schema so every file has identical column types
+SCHEMA = pa.schema([
+    ("timestamp", pa.timestamp("us", tz="UTC")),
+    ("run_id", pa.string()),
+    ("source_model", pa.string()),
+    ("claim", pa.string()),
+    ("label", pa.string()),
+    ("confidence", pa.float32()),
+    ("evidence_id", pa.string()),
+    ("trust_score", pa.float32())
+])
+COLUMNS = SCHEMA.names
+
+# Low-cardinality columns, turned into categoricals after loading
+CATEGORY_COLUMNS = ["source_model", "label", "evidence_id"]
+
+COMPACT_THRESHOLD = 64
+ROW_GROUP_SIZE = 256 * 1024
+# A compaction lock older than this is left over from a crashed process
+STALE_LOCK_SECONDS = 600
+# Reads are retried when a compaction removes files mid-read
+LOAD_RETRIES = 3
+
+# =========================
+# Write Path
+# =========================
+
+def record_results(results, trust_score, source_model="unknown", store_dir=STORE_DIR):
+    """
+    Appends one verification run (all its claims) to the store.
+    Every call is a new run: the caller decides whether re-verifying
+    the same text should be recorded again.
+    Returns the run id.
+    """
+    if not results:
+        return None
+
+    now = datetime.now(timezone.utc)
+    run_id = uuid.uuid4().hex
+
+    df = pd.DataFrame({
+        "timestamp": pd.Timestamp(now),
+        "run_id": run_id,
+        "source_model": source_model or "unknown",
+        "claim": [r.get("claim", "") for r in results],
+        "label": [r.get("label", "") for r in results],
+        "confidence": np.array([r.get("confidence", 0.0) for r in results], dtype="float32"),
+        "evidence_id": [(r.get("evidence") or {}).get("id", "") for r in results],
+        "trust_score": np.float32(trust_score)
+    })
+
+    partition = os.path.join(store_dir, f"date={now:%Y-%m-%d}")
+    os.makedirs(partition, exist_ok=True)
+    # Written under a hidden name first so readers never see a partial file
+    name = f"part-{now:%H%M%S}-{run_id[:8]}.parquet"
+    hidden = os.path.join(partition, f"_{name}")
+    pq.write_table(pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False), hidden)
+    os.replace(hidden, os.path.join(partition, name))
+
+    if len(part_files(partition)) >= COMPACT_THRESHOLD:
+        compact_partition(partition)
+
+    return run_id
+
+
+def part_files(partition):
+    return sorted(
+        os.path.join(partition, f) for f in os.listdir(partition)
+        if f.startswith("part-") and f.endswith(".parquet")
+    )
+
+
+def manifest_name(compact_name):
+    return f"_{compact_name}.manifest.json"
+
+
+def compacted_parts(partition, names):
+    """
+    Part file names already merged into a compact file that is visible
+    in this directory listing (names).
+    """
+    covered = set()
+    for name in names:
+        if not (name.startswith("_compact-") and name.endswith(".manifest.json")):
+            continue
+        compact = name[1:-len(".manifest.json")]
+        if compact not in names:
+            continue  # merge not finished (or crashed); parts still count
+        try:
+            with open(os.path.join(partition, name), "r", encoding="utf-8") as f:
+                covered.update(json.load(f))
+        except (OSError, ValueError):
+            continue  # removed by a finishing compaction; caller retries
+    return covered
+
+
+def data_files(partition):
+    """
+    Files a reader should load: compact files plus the part files
+    not yet merged into one, all from a single directory listing.
+    """
+    names = set(os.listdir(partition))
+    covered = compacted_parts(partition, names)
+    return sorted(
+        os.path.join(partition, name) for name in names
+        if name.endswith(".parquet")
+        and (name.startswith("compact-") or name.startswith("part-"))
+        and name not in covered
+    )
+
+
+def remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def finish_compactions(partition):
+    """
+    Completes or rolls back compactions interrupted by a crash:
+    parts covered by a visible compact file are deleted, leftovers of a
+    merge that never became visible are discarded.
+    """
+    names = set(os.listdir(partition))
+    for name in names:
+        if not (name.startswith("_compact-") and name.endswith(".manifest.json")):
+            continue
+        compact = name[1:-len(".manifest.json")]
+        if compact in names:
+            for part in compacted_parts(partition, {name, compact}):
+                remove_quietly(os.path.join(partition, part))
+        else:
+            remove_quietly(os.path.join(partition, f"_{compact}"))
+        remove_quietly(os.path.join(partition, name))
+
+
+def acquire_lock(lock_path):
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            if time.time() - os.path.getmtime(lock_path) < STALE_LOCK_SECONDS:
+                return None
+            os.remove(lock_path)
+        except OSError:
+            return None
+        return acquire_lock(lock_path)
+    os.close(fd)
+    return lock_path
+
+
+def compact_partition(partition):
+    """
+    Merges a day's per-run part files into one compact file.
+    Order: merged file written under a hidden name, manifest of merged
+    parts written, merged file renamed into place (readers now skip the
+    listed parts), parts deleted, manifest deleted. A crash at any point
+    loses no rows and double counts none. Returns the compact file path,
+    or None if another process is compacting or there is nothing to merge.
+    """
+    lock = acquire_lock(os.path.join(partition, "_compact.lock"))
+    if lock is None:
+        return None
+
+    try:
+        finish_compactions(partition)
+
+        parts = part_files(partition)
+        if len(parts) < 2:
+            return None
+
+        table = ds.dataset(parts, schema=SCHEMA, format="parquet").to_table()
+
+        name = f"compact-{datetime.now(timezone.utc):%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+        hidden = os.path.join(partition, f"_{name}")
+        pq.write_table(table, hidden, row_group_size=ROW_GROUP_SIZE)
+
+        manifest = os.path.join(partition, manifest_name(name))
+        with open(f"{manifest}.tmp", "w", encoding="utf-8") as f:
+            json.dump([os.path.basename(p) for p in parts], f)
+        os.replace(f"{manifest}.tmp", manifest)
+
+        final = os.path.join(partition, name)
+        os.replace(hidden, final)
+
+        for path in parts:
+            remove_quietly(path)
+        remove_quietly(manifest)
+        return final
+    finally:
+        remove_quietly(lock)
+
+
+def compact_store(store_dir=STORE_DIR):
+    """
+    Compacts every partition that has more than one part file.
+    """
+    return [p for p in map(compact_partition, list_partitions(store_dir)) if p]
+
+# =========================
+# Read Path
+# =========================
+
+def list_partitions(store_dir=STORE_DIR, start=None, end=None):
+    """
+    Returns partition directories, optionally pruned to a
+    YYYY-MM-DD date range (inclusive).
+    """
+    if not os.path.isdir(store_dir):
+        return []
+
+    partitions = []
+    for name in sorted(os.listdir(store_dir)):
+        if not name.startswith("date="):
+            continue
+        day = name[len("date="):]
+        if start and day < start:
+            continue
+        if end and day > end:
+            continue
+        partitions.append(os.path.join(store_dir, name))
+
+    return partitions
+
+
+def load_results(columns=None, start=None, end=None, store_dir=STORE_DIR):
+    """
+    Loads stored rows as one dataset read, fetching only the requested
+    columns and only the date=YYYY-MM-DD partitions inside [start, end].
+    If a concurrent compaction removes a file mid-read, the listing is
+    taken again and the read retried.
+    """
+    columns = columns or COLUMNS
+
+    for attempt in range(LOAD_RETRIES):
+        files = [f for p in list_partitions(store_dir, start, end) for f in data_files(p)]
+        if not files:
+            return pd.DataFrame(columns=columns)
+        try:
+            df = ds.dataset(files, schema=SCHEMA, format="parquet").to_table(columns=columns).to_pandas()
+            break
+        except FileNotFoundError:
+            if attempt == LOAD_RETRIES - 1:
+                raise
+
+    for col in CATEGORY_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype("category")
+
+    return df
+
+# =========================
+# Aggregation Queries
+# =========================
+
+def trust_score_distribution(start=None, end=None, store_dir=STORE_DIR):
+    """
+    Trust score distribution per source model (one score per run).
+    """
+    df = load_results(["run_id", "source_model", "trust_score"], start, end, store_dir)
+    runs = df.drop_duplicates("run_id")
+
+    return runs.groupby("source_model", observed=True)["trust_score"].describe(
+        percentiles=[0.1, 0.25, 0.5, 0.75, 0.9]
+    )
+
+
+def label_breakdown(start=None, end=None, store_dir=STORE_DIR):
+    """
+    Share of each verdict per source model.
+    """
+    df = load_results(["source_model", "label"], start, end, store_dir)
+
+    return pd.crosstab(df["source_model"], df["label"], normalize="index").round(3)
+
+
+def most_contradicted_passages(top_n=10, min_claims=1, start=None, end=None, store_dir=STORE_DIR):
+    """
+    Corpus passages that contradict claims most often,
+    with how often they were used as evidence at all.
+    """
+    df = load_results(["evidence_id", "label"], start, end, store_dir)
+    df = df[df["evidence_id"] != ""]
+
+    is_contradicted = (df["label"] == "Contradicted").to_numpy()
+    stats = pd.DataFrame({
+        "evidence_id": df["evidence_id"].to_numpy(),
+        "contradicted": is_contradicted.astype(np.int64)
+    }).groupby("evidence_id")["contradicted"].agg(["sum", "count"])
+
+    stats.columns = ["contradicted", "claims"]
+    stats["contradiction_rate"] = (stats["contradicted"] / stats["claims"]).round(3)
+    stats = stats[(stats["claims"] >= min_claims) & (stats["contradicted"] > 0)]
+
+    return stats.sort_values(["contradicted", "contradiction_rate"], ascending=False).head(top_n)
+
+# =========================
+# Local Report
+# =========================
+
+if __name__ == "__main__":
+    # python results_store.py [compact]
+    if sys.argv[1:] == ["compact"]:
+        print(f"🗜️ Compacted {len(compact_store())} partition(s)")
+        sys.exit(0)
+
+    print("📊 Trust score distribution per source model:")
+    print(trust_score_distribution())
+
+    print("\n🧾 Verdict breakdown per source model:")
+    print(label_breakdown())
+
+    print("\n🔴 Most contradicted corpus passages:")
+    print(most_contradicted_passages())
@@ -0,0 +1,234 @@
+import os
+
+# =========================
+# Runtime Modes
+# =========================
+# "multi":  one worker per box, every library uses all of its cores
+# "single": many workers per box, each pinned to its own cores and
+#           running torch / FAISS / tokenizers single-threaded
+#
+# Environment overrides (read once, before torch / faiss are imported):
+#   HALLUCINOT_RUNTIME_MODE   multi | single
+#   HALLUCINOT_THREADS        threads per library (overrides the mode default)
+#   HALLUCINOT_CPUS           core set to pin to, e.g. "0-3,8"
+#                             (default: every core this process may run on)
+#   HALLUCINOT_WORKER_ID      this worker's index (0-based)
+#   HALLUCINOT_WORKERS        number of workers sharing the core set; each
+#                             worker gets its own slice of it
+#
+# OMP_NUM_THREADS / MKL_NUM_THREADS / OPENBLAS_NUM_THREADS already set in the
+# environment are kept unless one of the HALLUCINOT_* thread settings above
+# (mode, threads, workers) is given. TOKENIZERS_PARALLELISM is only set
+# ("false") when a single-threaded setting is requested; otherwise HF keeps
+# its own default, including disabling parallelism after a fork.
+
+MODES = ("multi", "single")
+DEFAULT_MODE = "multi"
+
+THREAD_ENV_VARS = [
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS"
+]
+
+_settings = None
+
+# =========================
+# Helpers
+# =========================
+
+def parse_cpu_set(spec):
+    """
+    Parses "0-3,8" into [0, 1, 2, 3, 8].
+    """
+    cpus = set()
+    try:
+        for part in spec.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if "-" in part:
+                lo, hi = part.split("-", 1)
+                cpus.update(range(int(lo), int(hi) + 1))
+            else:
+                cpus.add(int(part))
+    except ValueError:
+        raise ValueError(f"Invalid CPU set {spec!r} (expected e.g. \"0-3,8\")")
+    return sorted(cpus)
+
+
+def available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def worker_cpus(cpus, worker_id, workers):
+    """
+    Gives each worker its own contiguous slice of the core set.
+    """
+    per_worker = max(1, len(cpus) // workers)
+    start = (worker_id * per_worker) % len(cpus)
+    return cpus[start:start + per_worker]
+
+
+def env_int(name):
+    value = os.environ.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+
+
+def validate_settings(threads, cpus, worker_id, workers):
+    """
+    Fails early with a readable message instead of a torch / OS error
+    deep inside the first import.
+    """
+    if threads is not None and threads < 1:
+        raise ValueError(f"Thread count must be at least 1, got {threads} (HALLUCINOT_THREADS)")
+
+    if workers is not None and workers < 1:
+        raise ValueError(f"HALLUCINOT_WORKERS must be at least 1, got {workers}")
+    if (worker_id is None) != (workers is None):
+        raise ValueError(
+            "HALLUCINOT_WORKER_ID and HALLUCINOT_WORKERS must be set together "
+            f"(got WORKER_ID={worker_id}, WORKERS={workers})"
+        )
+    if worker_id is not None and workers and not 0 <= worker_id < workers:
+        raise ValueError(f"HALLUCINOT_WORKER_ID must be in [0, {workers}), got {worker_id}")
+
+    if not cpus:
+        raise ValueError("CPU set is empty (HALLUCINOT_CPUS)")
+    allowed = set(available_cpus())
+    outside = sorted(set(cpus) - allowed)
+    if outside:
+        raise ValueError(
+            f"CPUs {outside} are not available to this process "
+            f"(HALLUCINOT_CPUS; allowed: {sorted(allowed)})"
+        )
+
+# =========================
+# Configuration
+# =========================
+
+def configure_runtime(mode=None, threads=None, cpus=None, worker_id=None, workers=None):
+    """
+    Sets thread counts for torch, FAISS and HF tokenizers and pins the
+    process to a core set. Call before importing torch / faiss so the
+    OpenMP / MKL pools pick up the limits; later calls are no-ops.
+    Returns the applied settings.
+    """
+    global _settings
+    if _settings is not None:
+        return _settings
+
+    mode = mode or os.environ.get("HALLUCINOT_RUNTIME_MODE")
+    mode_requested = mode is not None
+    mode = mode or DEFAULT_MODE
+    if mode not in MODES:
+        raise ValueError(f"Unknown runtime mode: {mode} (expected one of {MODES})")
+
+    threads = threads if threads is not None else env_int("HALLUCINOT_THREADS")
+    worker_id = worker_id if worker_id is not None else env_int("HALLUCINOT_WORKER_ID")
+    workers = workers if workers is not None else env_int("HALLUCINOT_WORKERS")
+
+    # Core set: explicit (argument / HALLUCINOT_CPUS) or every allowed core,
+    # then this worker's slice of it
+    if cpus is None and os.environ.get("HALLUCINOT_CPUS"):
+        cpus = parse_cpu_set(os.environ["HALLUCINOT_CPUS"])
+    if cpus is None:
+        cpus = available_cpus()
+
+    validate_settings(threads, cpus, worker_id, workers)
+    if worker_id is not None:
+        cpus = worker_cpus(cpus, worker_id, workers)
+
+    # Only an explicit HALLUCINOT_* thread setting overrides thread limits
+    # the environment (e.g. ops) already set
+    requested = threads is not None or mode_requested or workers is not None
+    preset = os.environ.get("OMP_NUM_THREADS")
+
+    if threads is None:
+        if not requested and preset and preset.isdigit() and int(preset) > 0:
+            threads = int(preset)
+        else:
+            threads = 1 if mode == "single" else len(cpus)
+
+    # Must happen before torch / faiss start their thread pools
+    sources = {}
+    for var in THREAD_ENV_VARS + ["TOKENIZERS_PARALLELISM"]:
+        if var in os.environ and not requested:
+            sources[var] = "environment"
+            continue
+        if var == "TOKENIZERS_PARALLELISM":
+            if not (requested and threads == 1):
+                sources[var] = "environment" if var in os.environ else "library default"
+                continue
+            os.environ[var] = "false"
+        else:
+            os.environ[var] = str(threads)
+        sources[var] = "HALLUCINOT_*" if requested else "default"
+
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+    apply_library_threads(threads)
+
+    _settings = {
+        "mode": mode,
+        "threads": threads,
+        "cpus": cpus,
+        "worker_id": worker_id,
+        "workers": workers,
+        "sources": sources
+    }
+    return _settings
+
+
+def apply_library_threads(threads):
+    import torch
+    import faiss
+
+    torch.set_num_threads(threads)
+    try:
+        # Only allowed once, before any inter-op parallel work has started
+        torch.set_num_interop_threads(max(1, min(threads, 4)))
+    except RuntimeError:
+        pass
+
+    faiss.omp_set_num_threads(threads)
+
+# =========================
+# Reporting
+# =========================
+
+def runtime_report():
+    """
+    Thread counts each library is actually using right now.
+    """
+    import torch
+    import faiss
+
+    settings = _settings or {}
+    return {
+        "mode": settings.get("mode"),
+        "worker": f"{settings.get('worker_id')}/{settings.get('workers')}",
+        "cpus": available_cpus(),
+        "torch_intra_op_threads": torch.get_num_threads(),
+        "torch_inter_op_threads": torch.get_num_interop_threads(),
+        "faiss_omp_threads": faiss.omp_get_max_threads(),
+        "tokenizers_parallelism": os.environ.get("TOKENIZERS_PARALLELISM"),
+        "omp_num_threads": os.environ.get("OMP_NUM_THREADS"),
+        # Where each variable's value came from:
+        # environment | HALLUCINOT_* | default | library default
+        "sources": settings.get("sources", {})
+    }
+
+
+if __name__ == "__main__":
+    configure_runtime()
+    for key, value in runtime_report().items():
+        print(f"{key}: {value}")
@@ -1,10 +1,22 @@
+from runtime_config import configure_runtime
+
+# Thread limits must be set before torch / faiss are imported
+RUNTIME = configure_runtime()
+
 import json
 import faiss
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
-# Load index
-index = faiss.read_index("data/corpus.index")
+from index_compression import (
+    INDEX_PATH, RERANK_FACTOR, load_index_config, load_full_vectors, search_index
+)
+
+# Load index (+ full vectors for re-ranking if it is compressed)
+index = faiss.read_index(INDEX_PATH)
+index_config = load_index_config()
+full_vectors = load_full_vectors(index_config)
+rerank_factor = index_config.get("rerank_factor", RERANK_FACTOR)
 
 # Load doc IDs
 with open("data/doc_ids.json", "r") as f:
@@ -20,10 +32,12 @@ def search(query, k=3):
     query_embedding = model.encode([query])
     query_embedding = np.array(query_embedding).astype("float32")
 
-    distances, indices = index.search(query_embedding, k)
+    distances, indices = search_index(index, query_embedding, k, full_vectors, rerank_factor)
 
     results = []
     for idx in indices[0]:
+        if idx == -1 or idx >= len(corpus):
+            continue
         results.append(corpus[idx])
 
     return results